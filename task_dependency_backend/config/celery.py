@@ -0,0 +1,16 @@
+"""
+Celery application for config project.
+
+Runs status cascades off the request path. Start a worker with:
+    celery -A config worker
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
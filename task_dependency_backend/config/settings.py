@@ -82,10 +82,33 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # One transaction per request, so status cascades flush once on commit
+        'ATOMIC_REQUESTS': True,
     }
 }
 
 
+# Cache
+# Holds the dependency graph used for cycle path tracing and the queued-cascade
+# markers (tasks/tasks.py). Outside DEBUG the web processes and the Celery
+# worker must see the same markers, so they share Redis; in DEBUG Celery runs
+# eagerly in-process and a local cache is enough.
+
+if DEBUG:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://localhost:6379/1',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -138,3 +161,9 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
 }
+
+# Celery Configuration
+# Status cascades run in a worker once the request's transaction commits
+CELERY_BROKER_URL = 'redis://localhost:6379/0'
+# Run tasks inline while developing, so a broker is only needed in production
+CELERY_TASK_ALWAYS_EAGER = DEBUG
@@ -0,0 +1,57 @@
+"""
+Batches signal-driven status cascades so each task is recomputed at most
+once per transaction.
+
+Signals only record which tasks are affected; once the transaction commits
+the whole batch is handed to the recompute_cascade Celery task, so the
+request itself never walks the dependency graph.
+"""
+import threading
+
+from django.db import transaction
+
+from tasks.tasks import schedule_cascade
+
+
+_dirty = threading.local()
+
+
+def mark_dirty(task_id):
+    """Re-evaluate task_id and every task that depends on it."""
+    _enqueue('task_ids', task_id)
+
+
+def mark_changed(task_id):
+    """Re-evaluate every task that depends on task_id (but not task_id itself)."""
+    _enqueue('source_ids', task_id)
+
+
+def _enqueue(bucket, task_id):
+    if not hasattr(_dirty, 'task_ids'):
+        _dirty.task_ids = set()
+        _dirty.source_ids = set()
+    getattr(_dirty, bucket).add(task_id)
+
+    # A flush in progress drains the sets until they're empty
+    if getattr(_dirty, 'flushing', False):
+        return
+
+    # Registered on every call rather than once behind a flag: a rolled-back
+    # savepoint discards its callbacks, and only Django knows which ones
+    # survive. The first flush to run drains the sets, so the rest are no-ops.
+    # Ids queued by a transaction that rolled back ride along with the next
+    # flush, which only re-evaluates them against the committed data
+    transaction.on_commit(_flush)
+
+
+def _flush():
+    _dirty.flushing = True
+    try:
+        # Eager Celery runs the cascade inline, and anything it queues is
+        # picked up by the next pass
+        while _dirty.task_ids or _dirty.source_ids:
+            task_ids, _dirty.task_ids = _dirty.task_ids, set()
+            source_ids, _dirty.source_ids = _dirty.source_ids, set()
+            schedule_cascade(sorted(task_ids), sorted(source_ids))
+    finally:
+        _dirty.flushing = False
@@ -13,3 +13,4 @@ class TaskAdmin(admin.ModelAdmin):
 @admin.register(TaskDependency)
 class TaskDependencyAdmin(admin.ModelAdmin):
     list_display = ('id', 'task', 'depends_on', 'created_at')
+    list_select_related = ('task', 'depends_on')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.models import TaskReachability
+from tasks.services.reachability import ReachabilityIndex
+
+
+class Command(BaseCommand):
+    help = "Recompute the TaskReachability closure table from TaskDependency."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            ReachabilityIndex.rebuild()
+        self.stdout.write(
+            f"Rebuilt closure: {TaskReachability.objects.count()} reachability rows"
+        )
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-14 03:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_closure(apps, schema_editor):
+    TaskDependency = apps.get_model('tasks', 'TaskDependency')
+    TaskReachability = apps.get_model('tasks', 'TaskReachability')
+
+    adjacency = {}
+    for task_id, depends_on_id in TaskDependency.objects.values_list('task_id', 'depends_on_id'):
+        adjacency.setdefault(task_id, []).append(depends_on_id)
+
+    rows = []
+    for ancestor_id in adjacency:
+        seen = set()
+        stack = list(adjacency[ancestor_id])
+        while stack:
+            current_id = stack.pop()
+            if current_id in seen:
+                continue
+            seen.add(current_id)
+            stack.extend(adjacency.get(current_id, ()))
+        rows.extend(
+            TaskReachability(ancestor_id=ancestor_id, descendant_id=d)
+            for d in seen
+        )
+
+    TaskReachability.objects.bulk_create(rows, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskReachability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.task')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor'], name='tasks_taskr_ancesto_13178f_idx'), models.Index(fields=['descendant'], name='tasks_taskr_descend_5a7d6e_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-14 03:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_taskreachability'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='taskdependency',
+            name='tasks_taskd_task_id_ec8227_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='taskdependency',
+            name='tasks_taskd_depends_7c20fd_idx',
+        ),
+        migrations.AlterField(
+            model_name='taskdependency',
+            name='depends_on',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='dependent_tasks', to='tasks.task'),
+        ),
+        migrations.AlterField(
+            model_name='taskdependency',
+            name='task',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='dependencies', to='tasks.task'),
+        ),
+        migrations.AddIndex(
+            model_name='taskdependency',
+            index=models.Index(fields=['depends_on', 'task'], name='td_dep_task_covering_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-14 03:08
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_depends_on_status(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskDependency = apps.get_model('tasks', 'TaskDependency')
+    TaskDependency.objects.update(
+        depends_on_status=Subquery(
+            Task.objects.filter(pk=OuterRef('depends_on_id')).values('status')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_taskdependency_covering_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskdependency',
+            name='depends_on_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('blocked', 'Blocked')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='taskdependency',
+            index=models.Index(fields=['task', 'depends_on_status'], name='td_task_dep_status_idx'),
+        ),
+        migrations.RunPython(copy_depends_on_status, migrations.RunPython.noop),
+    ]
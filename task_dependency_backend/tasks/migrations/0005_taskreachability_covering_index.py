@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-14 03:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_taskdependency_depends_on_status'),
+    ]
+
+    # The composite index goes in first, so descendant_id is never left
+    # without an index (MySQL requires one for the foreign key)
+    operations = [
+        migrations.AddIndex(
+            model_name='taskreachability',
+            index=models.Index(fields=['descendant', 'ancestor'], name='tr_desc_anc_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='taskreachability',
+            name='tasks_taskr_ancesto_13178f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='taskreachability',
+            name='tasks_taskr_descend_5a7d6e_idx',
+        ),
+        migrations.AlterField(
+            model_name='taskreachability',
+            name='ancestor',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.task'),
+        ),
+        migrations.AlterField(
+            model_name='taskreachability',
+            name='descendant',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.task'),
+        ),
+    ]
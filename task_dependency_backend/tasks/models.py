@@ -1,6 +1,12 @@
 from django.db import models
 
 
+class TaskQuerySet(models.QuerySet):
+    def slim(self):
+        """Skip the description TextField on paths that never read it."""
+        return self.defer('description')
+
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -15,6 +21,8 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TaskQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
     
@@ -23,25 +31,75 @@ class Task(models.Model):
 
 
 class TaskDependency(models.Model):
+    # Both columns are covered by the composite indexes below, so the
+    # per-column ForeignKey indexes would only add write cost
     task = models.ForeignKey(
         Task, 
         on_delete=models.CASCADE, 
-        related_name='dependencies'
+        related_name='dependencies',
+        db_index=False
     )
     depends_on = models.ForeignKey(
         Task, 
         on_delete=models.CASCADE, 
-        related_name='dependent_tasks'
+        related_name='dependent_tasks',
+        db_index=False
+    )
+    # Copy of depends_on.status, kept in sync by StatusUpdater and the
+    # task_status_changed signal, so status checks don't need a JOIN
+    depends_on_status = models.CharField(
+        max_length=20,
+        choices=Task.STATUS_CHOICES,
+        default='pending'
     )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
+        # (task, depends_on) serves forward lookups, (depends_on, task)
+        # serves reverse lookups; both are index-only for edge scans.
+        # (task, depends_on_status) answers status checks from the index alone
         unique_together = ('task', 'depends_on')
         indexes = [
-            models.Index(fields=['task']),
-            models.Index(fields=['depends_on']),
+            models.Index(fields=['depends_on', 'task'], name='td_dep_task_covering_idx'),
+            models.Index(fields=['task', 'depends_on_status'], name='td_task_dep_status_idx'),
         ]
     
     def __str__(self):
         return f"{self.task.title} depends on {self.depends_on.title}"
+    
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.depends_on_status = self.depends_on.status
+        super().save(*args, **kwargs)
+
 
+class TaskReachability(models.Model):
+    """
+    Transitive closure of TaskDependency: one row per (ancestor, descendant)
+    pair where ancestor depends on descendant directly or indirectly.
+    """
+    # Both directions are covered by the composite indexes below, so the
+    # largest table here carries no single-column FK indexes
+    ancestor = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False
+    )
+    descendant = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False
+    )
+    
+    class Meta:
+        # Also serves lookups by ancestor
+        unique_together = ('ancestor', 'descendant')
+        indexes = [
+            # Lookups by descendant: who (transitively) depends on this task
+            models.Index(fields=['descendant', 'ancestor'], name='tr_desc_anc_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.ancestor_id} reaches {self.descendant_id}"
@@ -4,7 +4,7 @@ from .models import Task, TaskDependency
 
 class TaskDependencySerializer(serializers.ModelSerializer):
     depends_on_title = serializers.CharField(source='depends_on.title', read_only=True)
-    depends_on_status = serializers.CharField(source='depends_on.status', read_only=True)
+    depends_on_status = serializers.CharField(read_only=True)
     
     class Meta:
         model = TaskDependency
@@ -23,30 +23,6 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
     
     def get_dependent_tasks(self, obj):
-        return list(obj.dependent_tasks.values_list('task_id', flat=True))
+        # Iterate .all() so the prefetched rows are used
+        return [dep.task_id for dep in obj.dependent_tasks.all()]
 
-
-class GraphSerializer(serializers.Serializer):
-    nodes = serializers.SerializerMethodField()
-    edges = serializers.SerializerMethodField()
-    
-    def get_nodes(self, obj):
-        tasks = obj.get('tasks', [])
-        return [
-            {
-                'id': task.id,
-                'title': task.title,
-                'status': task.status
-            }
-            for task in tasks
-        ]
-    
-    def get_edges(self, obj):
-        dependencies = obj.get('dependencies', [])
-        return [
-            {
-                'from': dep.task_id,
-                'to': dep.depends_on_id
-            }
-            for dep in dependencies
-        ]
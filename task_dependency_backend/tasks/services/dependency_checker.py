@@ -1,48 +1,228 @@
-from tasks.models import Task, TaskDependency
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from tasks.models import Task, TaskDependency, TaskReachability
+
+
+GRAPH_VERSION_KEY = 'td_version'
+GRAPH_CACHE_TIMEOUT = 3600
 
 
 class DependencyChecker:
     @staticmethod
     def check_circular_dependency(task_id, depends_on_id):
         """
-        Detect circular dependencies using DFS.
+        Detect circular dependencies with one lookup in the closure table.
+        Must run inside a transaction, as the lookup is a locking read.
         Returns: (is_circular: bool, cycle_path: list)
         """
         # Edge case: Task cannot depend on itself
         if task_id == depends_on_id:
             return (True, [task_id, task_id])
-        
-        visited = set()
+
+        # Adding task -> depends_on is circular iff depends_on already reaches
+        # task. A locking read, so callers that locked both tasks (see
+        # ReachabilityIndex.lock_tasks) see rows committed since they began
+        reaches_task = TaskReachability.objects.select_for_update().filter(
+            ancestor_id=depends_on_id,
+            descendant_id=task_id
+        ).values_list('pk', flat=True).first() is not None
+
+        if not reaches_task:
+            return (False, [])
+
+        found, path = DependencyChecker.find_cycle_path(
+            task_id,
+            depends_on_id,
+            DependencyChecker.cached_graph()
+        )
+        if not found:
+            # The cached graph predates an edge the closure already knows about
+            _, path = DependencyChecker.find_cycle_path(task_id, depends_on_id)
+
+        # The closure is authoritative; the path is only for the error message
+        return (True, path)
+
+    @staticmethod
+    def check_batch(pairs):
+        """
+        Validate many proposed (task_id, depends_on_id) edges at once.
+        Returns the cycles the batch would create (see find_all_cycles).
+        """
+        return DependencyChecker.find_all_cycles(extra_edges=pairs)
+
+    @staticmethod
+    def find_all_cycles(extra_edges=()):
+        """
+        Find every cycle in the dependency graph (plus extra_edges) in one
+        O(V + E) pass, using an iterative Tarjan's SCC algorithm.
+        Returns: list of strongly connected components (lists of task ids)
+        that contain a cycle.
+        """
+        adjacency = DependencyChecker.load_adjacency()
+        for task_id, depends_on_id in extra_edges:
+            adjacency[task_id].append(depends_on_id)
+
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        cycles = []
+
+        for root_id in list(adjacency):
+            if root_id in index:
+                continue
+
+            index[root_id] = lowlink[root_id] = len(index)
+            stack.append(root_id)
+            on_stack.add(root_id)
+            work = [(root_id, iter(adjacency.get(root_id, ())))]
+
+            while work:
+                current_id, children = work[-1]
+
+                for dep_id in children:
+                    if dep_id not in index:
+                        index[dep_id] = lowlink[dep_id] = len(index)
+                        stack.append(dep_id)
+                        on_stack.add(dep_id)
+                        work.append((dep_id, iter(adjacency.get(dep_id, ()))))
+                        break
+                    if dep_id in on_stack:
+                        lowlink[current_id] = min(lowlink[current_id], index[dep_id])
+                else:
+                    # All children explored
+                    work.pop()
+                    if work:
+                        parent_id = work[-1][0]
+                        lowlink[parent_id] = min(lowlink[parent_id], lowlink[current_id])
+
+                    if lowlink[current_id] == index[current_id]:
+                        component = []
+                        while True:
+                            member_id = stack.pop()
+                            on_stack.discard(member_id)
+                            component.append(member_id)
+                            if member_id == current_id:
+                                break
+
+                        # A single task is only a cycle if it depends on itself
+                        if len(component) > 1 or current_id in adjacency.get(current_id, ()):
+                            cycles.append(component)
+
+        return cycles
+
+    @staticmethod
+    def find_cycle_path(task_id, depends_on_id, graph=None):
+        """
+        Find the path depends_on -> ... -> task with a bidirectional BFS:
+        forward from depends_on along its dependencies and backward from
+        task along its dependents, stopping as soon as the frontiers meet.
+        Returns: (is_circular: bool, cycle_path: list)
+        """
+        if graph is None:
+            graph = DependencyChecker.load_graph()
+        forward, backward = graph
+
+        # fwd_parent points back toward depends_on, bwd_parent toward task
+        fwd_parent = {depends_on_id: None}
+        bwd_parent = {task_id: None}
+        fwd_front = [depends_on_id]
+        bwd_front = [task_id]
+
+        meeting_id = task_id if task_id == depends_on_id else None
+        while meeting_id is None and fwd_front and bwd_front:
+            # Expand the smaller frontier by one level
+            if len(fwd_front) <= len(bwd_front):
+                fwd_front, meeting_id = DependencyChecker._expand(
+                    fwd_front, forward, fwd_parent, bwd_parent
+                )
+            else:
+                bwd_front, meeting_id = DependencyChecker._expand(
+                    bwd_front, backward, bwd_parent, fwd_parent
+                )
+
+        if meeting_id is None:
+            return (False, [])
+
+        # Stitch the two halves together at the meeting task
         path = []
-        
-        def dfs(current_id):
-            # Found cycle - we've reached the original task
-            if current_id == task_id:
-                path.append(current_id)
-                return True
-            
-            # Already explored this path
-            if current_id in visited:
-                return False
-            
-            visited.add(current_id)
+        current_id = meeting_id
+        while current_id is not None:
+            path.append(current_id)
+            current_id = fwd_parent[current_id]
+        path.reverse()
+
+        current_id = bwd_parent[meeting_id]
+        while current_id is not None:
             path.append(current_id)
-            
-            # Get all dependencies of current task
-            dependencies = TaskDependency.objects.filter(
-                task_id=current_id
-            ).values_list('depends_on_id', flat=True)
-            
-            # Recursively check each dependency
-            for dep_id in dependencies:
-                if dfs(dep_id):
-                    return True
-            
-            # Backtrack
-            path.pop()
-            visited.remove(current_id)
-            return False
-        
-        # Start DFS from the proposed dependency
-        has_cycle = dfs(depends_on_id)
-        return (has_cycle, path if has_cycle else [])
+            current_id = bwd_parent[current_id]
+
+        return (True, path)
+
+    @staticmethod
+    def _expand(frontier, adjacency, parent, other_parent):
+        """Advance one BFS level; returns the new frontier and any meeting task."""
+        next_front = []
+        for current_id in frontier:
+            for neighbour_id in adjacency.get(current_id, ()):
+                if neighbour_id in parent:
+                    continue
+                parent[neighbour_id] = current_id
+                if neighbour_id in other_parent:
+                    return next_front, neighbour_id
+                next_front.append(neighbour_id)
+        return next_front, None
+
+    @staticmethod
+    def load_graph():
+        """
+        Fetch every dependency edge in one query as a pair of adjacency maps:
+        task_id -> [depends_on_id] and depends_on_id -> [task_id].
+        """
+        forward = defaultdict(list)
+        backward = defaultdict(list)
+        edges = TaskDependency.objects.values_list('task_id', 'depends_on_id')
+        for task_id, depends_on_id in edges.iterator(chunk_size=5000):
+            forward[task_id].append(depends_on_id)
+            backward[depends_on_id].append(task_id)
+        return forward, backward
+
+    @staticmethod
+    def cached_graph():
+        """
+        load_graph() cached under the current graph version, so repeated
+        checks between dependency edits don't hit the database.
+        """
+        key = f'td_graph:{cache.get(GRAPH_VERSION_KEY, 0)}'
+        graph = cache.get(key)
+        if graph is None:
+            graph = DependencyChecker.load_graph()
+            cache.set(key, graph, timeout=GRAPH_CACHE_TIMEOUT)
+        return graph
+
+    @staticmethod
+    def invalidate_graph():
+        """
+        Move to a new graph version; old cache entries simply expire.
+        Bumped again on commit, in case another request cached the graph
+        before this transaction's edges were visible.
+        """
+        DependencyChecker._bump_graph_version()
+        transaction.on_commit(DependencyChecker._bump_graph_version)
+
+    @staticmethod
+    def _bump_graph_version():
+        cache.add(GRAPH_VERSION_KEY, 0, timeout=None)
+        cache.incr(GRAPH_VERSION_KEY)
+
+    @staticmethod
+    def load_adjacency():
+        """Fetch every dependency edge in one query as task_id -> [depends_on_id]."""
+        adjacency = defaultdict(list)
+        edges = TaskDependency.objects.values_list('task_id', 'depends_on_id')
+        for task_id, depends_on_id in edges.iterator(chunk_size=5000):
+            adjacency[task_id].append(depends_on_id)
+        return adjacency
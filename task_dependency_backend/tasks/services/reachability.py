@@ -0,0 +1,184 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from tasks.models import Task, TaskDependency, TaskReachability
+from tasks.services.dependency_checker import DependencyChecker
+
+
+class ReachabilityIndex:
+    """
+    Keeps the TaskReachability closure table in sync with TaskDependency.
+
+    Closure rows are derived from other closure rows, so two transactions
+    extending it at once must not both work from what they saw before the
+    other committed. Each edit row-locks its endpoint tasks before reading
+    the closure, and reads it with locking reads: edits that share a task
+    run one after another, and on MySQL (InnoDB) the range locks make other
+    overlapping edits wait for each other, or fail with a deadlock and roll
+    back, rather than commit a partial closure. If the table is ever out
+    of step anyway (e.g. after raw SQL or bulk writes that skip signals),
+    run `python manage.py rebuild_reachability`.
+    """
+
+    @staticmethod
+    def ancestors_of(task_id):
+        """Tasks that (transitively) depend on task_id."""
+        return set(
+            TaskReachability.objects.filter(
+                descendant_id=task_id
+            ).values_list('ancestor_id', flat=True)
+        )
+
+    @staticmethod
+    def descendants_of(task_id):
+        """Tasks that task_id (transitively) depends on."""
+        return set(
+            TaskReachability.objects.filter(
+                ancestor_id=task_id
+            ).values_list('descendant_id', flat=True)
+        )
+
+    @staticmethod
+    def lock_tasks(task_ids):
+        """
+        Row-lock task_ids until the current transaction ends. Locks are
+        taken in pk order, so two edits over the same tasks can't deadlock.
+        """
+        list(
+            Task.objects.select_for_update().filter(
+                pk__in=task_ids
+            ).order_by('pk').values_list('pk', flat=True)
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def add_dependency(task_id, depends_on_id):
+        """Extend the closure with the new edge task -> depends_on."""
+        ReachabilityIndex.lock_tasks([task_id, depends_on_id])
+
+        # Locking reads see rows committed after this transaction began
+        ancestors = {task_id} | set(
+            TaskReachability.objects.select_for_update().filter(
+                descendant_id=task_id
+            ).values_list('ancestor_id', flat=True)
+        )
+        descendants = {depends_on_id} | set(
+            TaskReachability.objects.select_for_update().filter(
+                ancestor_id=depends_on_id
+            ).values_list('descendant_id', flat=True)
+        )
+
+        TaskReachability.objects.bulk_create(
+            [
+                TaskReachability(ancestor_id=a, descendant_id=d)
+                for a in ancestors
+                for d in descendants
+            ],
+            ignore_conflicts=True
+        )
+
+    @staticmethod
+    def add_dependencies(task_ids):
+        """Extend the closure after edges from task_ids were bulk-inserted."""
+        ancestors = set(
+            TaskReachability.objects.filter(
+                descendant_id__in=task_ids
+            ).values_list('ancestor_id', flat=True)
+        )
+        ReachabilityIndex._recompute(ancestors | set(task_ids))
+
+    @staticmethod
+    @transaction.atomic
+    def remove_dependency(task_id):
+        """Recompute the closure rows of every task that could reach a removed edge."""
+        ReachabilityIndex.lock_tasks([task_id])
+        ReachabilityIndex._recompute(ReachabilityIndex.ancestors_of(task_id) | {task_id})
+
+    @staticmethod
+    def rebuild():
+        """Recompute the whole closure table from TaskDependency."""
+        TaskReachability.objects.all().delete()
+        task_ids = set(
+            TaskDependency.objects.values_list('task_id', flat=True).distinct()
+        )
+        ReachabilityIndex._recompute(task_ids, DependencyChecker.load_adjacency())
+
+    @staticmethod
+    def _recompute(task_ids, adjacency=None):
+        if adjacency is None:
+            adjacency = ReachabilityIndex._load_subgraph(task_ids)
+        reach = ReachabilityIndex._reach_sets(adjacency, task_ids)
+
+        rows = [
+            TaskReachability(ancestor_id=ancestor_id, descendant_id=d)
+            for ancestor_id in task_ids
+            for d in reach[ancestor_id]
+        ]
+
+        TaskReachability.objects.filter(ancestor_id__in=task_ids).delete()
+        TaskReachability.objects.bulk_create(rows, batch_size=5000)
+
+    @staticmethod
+    def _load_subgraph(task_ids):
+        """
+        Fetch only the dependency edges reachable from task_ids, as
+        task_id -> [depends_on_id]. The existing closure rows let each
+        round jump straight to everything already known to be reachable;
+        further rounds only follow edges the closure doesn't cover yet.
+        """
+        adjacency = defaultdict(list)
+        loaded = set()
+        frontier = set(task_ids)
+        while frontier:
+            known = set(
+                TaskReachability.objects.filter(
+                    ancestor_id__in=frontier
+                ).values_list('descendant_id', flat=True)
+            )
+            to_load = (frontier | known) - loaded
+            loaded |= to_load
+
+            edges = TaskDependency.objects.filter(
+                task_id__in=to_load
+            ).values_list('task_id', 'depends_on_id')
+            frontier = set()
+            for task_id, depends_on_id in edges.iterator(chunk_size=5000):
+                adjacency[task_id].append(depends_on_id)
+                if depends_on_id not in loaded:
+                    frontier.add(depends_on_id)
+        return adjacency
+
+    @staticmethod
+    def _reach_sets(adjacency, task_ids):
+        """
+        Everything reachable from each of task_ids via depends_on edges,
+        built in one post-order walk: a task's set is the union of its
+        dependencies' sets, so shared sub-graphs are traversed only once.
+        """
+        reach = {}
+        for root_id in task_ids:
+            if root_id in reach:
+                continue
+
+            active = {root_id}
+            work = [(root_id, iter(adjacency[root_id]))]
+            while work:
+                current_id, children = work[-1]
+
+                for dep_id in children:
+                    # Tasks still in `active` would only be met again via a cycle
+                    if dep_id not in reach and dep_id not in active:
+                        active.add(dep_id)
+                        work.append((dep_id, iter(adjacency[dep_id])))
+                        break
+                else:
+                    # All dependencies done: merge their sets (set.update runs in C)
+                    work.pop()
+                    active.discard(current_id)
+                    seen = set(adjacency[current_id])
+                    for dep_id in adjacency[current_id]:
+                        seen.update(reach.get(dep_id, ()))
+                    reach[current_id] = seen
+
+        return reach
@@ -1,56 +1,175 @@
-from tasks.models import Task, TaskDependency
+from collections import defaultdict, deque
+
+from django.db import transaction
+from django.db.models import Case, Exists, F, OuterRef, Value, When
+from django.utils import timezone
+
+from tasks.models import Task, TaskDependency, TaskReachability
 
 
 class StatusUpdater:
     @staticmethod
-    def update_task_status(task):
-        """Update a single task's status based on its dependencies."""
-        # Get all tasks this task depends on
-        dependencies = TaskDependency.objects.filter(
-            task=task
-        ).select_related('depends_on')
-        
+    def resolve_status(current_status, dependency_statuses):
+        """Work out a task's status from the statuses of its dependencies."""
+        statuses = set(dependency_statuses)
+
         # No dependencies = user-controlled status
-        if not dependencies.exists():
-            return
-        
-        dependency_statuses = [dep.depends_on.status for dep in dependencies]
-        
+        if not statuses:
+            return current_status
+
         # Any blocked dependency → task is blocked
-        if 'blocked' in dependency_statuses:
-            if task.status != 'blocked':
-                task.status = 'blocked'
-                task.save(update_fields=['status', 'updated_at'])
-            return
-        
+        if 'blocked' in statuses:
+            return 'blocked'
+
+        # Don't override if already completed or in_progress
+        if current_status in ['completed', 'in_progress']:
+            return current_status
+
         # All completed → task is ready (in_progress)
-        if all(s == 'completed' for s in dependency_statuses):
-            # Don't override if already completed or in_progress
-            if task.status not in ['completed', 'in_progress']:
-                task.status = 'in_progress'
-                task.save(update_fields=['status', 'updated_at'])
-            return
-        
+        if statuses == {'completed'}:
+            return 'in_progress'
+
         # Mixed states → pending
-        if task.status not in ['completed', 'in_progress']:
-            task.status = 'pending'
-            task.save(update_fields=['status', 'updated_at'])
-    
+        return 'pending'
+
+    @staticmethod
+    def _set_status(task_ids, new_status):
+        """
+        Write new_status with a plain UPDATE: no model save(), no post_save.
+        Returns the updated_at timestamp that was written.
+        """
+        now = timezone.now()
+        Task.objects.filter(pk__in=task_ids).update(status=new_status, updated_at=now)
+        StatusUpdater.sync_dependency_status(task_ids, new_status)
+        return now
+
+    @staticmethod
+    def sync_dependency_status(task_ids, new_status):
+        """Copy a new status onto every TaskDependency.depends_on_status that mirrors it."""
+        TaskDependency.objects.filter(
+            depends_on_id__in=task_ids
+        ).exclude(
+            depends_on_status=new_status
+        ).update(depends_on_status=new_status)
+
+    @staticmethod
+    def update_dependent_tasks(task):
+        """Update all tasks that (transitively) depend on this task."""
+        StatusUpdater.propagate(source_ids=[task.id])
+
     @staticmethod
-    def update_dependent_tasks(task, depth=0):
-        """Update all tasks that depend on this task."""
-        # Prevent infinite recursion
-        if depth > 50:
+    def propagate(task_ids=(), source_ids=()):
+        """
+        Re-evaluate task_ids and every task that (transitively) depends on
+        task_ids or source_ids. Each affected task is evaluated once, after
+        its dependencies, and changes are written with one UPDATE per new
+        status. Tasks nothing depends on are resolved in the database instead.
+        """
+        # Every task that can reach one of the roots through its dependencies
+        ancestor_ids = set(
+            TaskReachability.objects.filter(
+                descendant_id__in=set(task_ids) | set(source_ids)
+            ).values_list('ancestor_id', flat=True)
+        )
+        if not ancestor_ids:
+            # Nothing depends on task_ids, so there's no cascade and no
+            # dependency row mirroring their status
+            if task_ids:
+                StatusUpdater._resolve_in_db(task_ids)
             return
-        
-        # Find all tasks that have this task as a dependency
-        dependent_task_ids = TaskDependency.objects.filter(
-            depends_on=task
-        ).values_list('task_id', flat=True)
-        
-        # Update each dependent task
-        for task_id in dependent_task_ids:
-            dependent_task = Task.objects.get(id=task_id)
-            StatusUpdater.update_task_status(dependent_task)
-            # Recursively update tasks that depend on the dependent task
-            StatusUpdater.update_dependent_tasks(dependent_task, depth + 1)
+
+        affected_ids = set(task_ids) | ancestor_ids
+
+        # Cascades that share tasks run one after another: each takes the
+        # row locks (in pk order, so two cascades can't deadlock) before
+        # reading any status, so a job holding an older snapshot can't
+        # finish its UPDATE after a newer one
+        with transaction.atomic():
+            StatusUpdater._evaluate(affected_ids)
+
+    @staticmethod
+    def _resolve_in_db(task_ids):
+        """
+        Apply resolve_status to task_ids with one conditional UPDATE that
+        works the new status out in the database. The UPDATE locks and
+        reads each row itself, so it needs no separate lock.
+        """
+        dependencies = TaskDependency.objects.filter(task=OuterRef('pk'))
+
+        # Same rules as resolve_status, in the same order. The subqueries only
+        # read tasks_taskdependency, so MySQL accepts them in this UPDATE
+        new_status = Case(
+            When(
+                Exists(dependencies.filter(depends_on_status='blocked')),
+                then=Value('blocked')
+            ),
+            When(status__in=['completed', 'in_progress'], then=F('status')),
+            When(
+                ~Exists(dependencies.exclude(depends_on_status='completed')),
+                then=Value('in_progress')
+            ),
+            default=Value('pending'),
+        )
+
+        # No dependencies = user-controlled status, so rows without any are skipped
+        Task.objects.filter(
+            Exists(dependencies),
+            pk__in=task_ids
+        ).exclude(
+            status=new_status
+        ).update(
+            status=new_status,
+            updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def _evaluate(affected_ids):
+        """Lock and re-evaluate affected_ids; see propagate()."""
+        statuses = dict(
+            Task.objects.select_for_update().filter(
+                pk__in=affected_ids
+            ).order_by('pk').values_list('id', 'status')
+        )
+
+        # The subgraph induced by the affected tasks. Tasks without
+        # dependencies never change, and tasks deleted since they were
+        # queued are neither locked nor loaded
+        dependencies = TaskDependency.objects.filter(
+            task_id__in=statuses
+        ).values_list('task_id', 'depends_on_id', 'depends_on_status')
+
+        depends_on_ids = defaultdict(list)
+        for task_id, depends_on_id, depends_on_status in dependencies:
+            statuses.setdefault(depends_on_id, depends_on_status)
+            depends_on_ids[task_id].append(depends_on_id)
+
+        # Kahn's algorithm: evaluate each task after all of its dependencies
+        dependents = defaultdict(list)
+        indegree = dict.fromkeys(depends_on_ids, 0)
+        for task_id, dep_ids in depends_on_ids.items():
+            for dep_id in dep_ids:
+                if dep_id in indegree:
+                    dependents[dep_id].append(task_id)
+                    indegree[task_id] += 1
+
+        queue = deque(task_id for task_id, degree in indegree.items() if degree == 0)
+        changed = defaultdict(list)
+        while queue:
+            task_id = queue.popleft()
+            dependency_statuses = [statuses[dep_id] for dep_id in depends_on_ids[task_id]]
+
+            # Later tasks read the updated status from the same dict
+            new_status = StatusUpdater.resolve_status(statuses[task_id], dependency_statuses)
+            if new_status != statuses[task_id]:
+                statuses[task_id] = new_status
+                changed[new_status].append(task_id)
+
+            for dependent_id in dependents[task_id]:
+                indegree[dependent_id] -= 1
+                if indegree[dependent_id] == 0:
+                    queue.append(dependent_id)
+
+        # The whole downstream graph was evaluated above, so nothing is
+        # queued for these writes
+        for new_status, changed_ids in changed.items():
+            StatusUpdater._set_status(changed_ids, new_status)
@@ -1,9 +1,19 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from tasks import _cascade
 from tasks.models import Task, TaskDependency
+from tasks.services.dependency_checker import DependencyChecker
+from tasks.services.reachability import ReachabilityIndex
 from tasks.services.status_updater import StatusUpdater
 
 
+@receiver(post_save, sender=TaskDependency)
+@receiver(post_delete, sender=TaskDependency)
+def dependency_graph_changed(sender, instance, **kwargs):
+    """Invalidate the cached dependency graph on any edge change."""
+    DependencyChecker.invalidate_graph()
+
+
 @receiver(post_save, sender=Task)
 def task_status_changed(sender, instance, created, **kwargs):
     """When a task's status changes, update dependent tasks."""
@@ -11,19 +21,24 @@ def task_status_changed(sender, instance, created, **kwargs):
         # New task created - no need to update dependents
         return
     
+    # Keep the denormalized copy on dependency rows current
+    StatusUpdater.sync_dependency_status([instance.id], instance.status)
+    
     # If status changed to 'completed' or 'blocked', update dependent tasks
     if instance.status in ['completed', 'blocked']:
-        StatusUpdater.update_dependent_tasks(instance)
+        _cascade.mark_changed(instance.id)
 
 
 @receiver(post_save, sender=TaskDependency)
 def dependency_added(sender, instance, created, **kwargs):
     """When a dependency is added, update the task's status."""
     if created:
-        StatusUpdater.update_task_status(instance.task)
+        ReachabilityIndex.add_dependency(instance.task_id, instance.depends_on_id)
+        _cascade.mark_dirty(instance.task_id)
 
 
 @receiver(post_delete, sender=TaskDependency)
 def dependency_removed(sender, instance, **kwargs):
     """When a dependency is removed, update the task's status."""
-    StatusUpdater.update_task_status(instance.task)
+    ReachabilityIndex.remove_dependency(instance.task_id)
+    _cascade.mark_dirty(instance.task_id)
@@ -0,0 +1,58 @@
+import logging
+
+from celery import shared_task
+from django.core.cache import cache
+
+from tasks.services.status_updater import StatusUpdater
+
+
+logger = logging.getLogger(__name__)
+
+# How long a root stays marked as queued if its job is lost
+PENDING_TIMEOUT = 300
+
+
+def _pending_keys(task_ids, source_ids):
+    return (
+        [f'cascade-pending:task:{task_id}' for task_id in task_ids]
+        + [f'cascade-pending:source:{task_id}' for task_id in source_ids]
+    )
+
+
+def schedule_cascade(task_ids, source_ids):
+    """
+    Queue recompute_cascade for the given roots, skipping any root that is
+    already waiting in the queue; that job will see the latest state anyway.
+    """
+    task_ids = [
+        task_id for task_id in task_ids
+        if cache.add(f'cascade-pending:task:{task_id}', True, PENDING_TIMEOUT)
+    ]
+    source_ids = [
+        task_id for task_id in source_ids
+        if cache.add(f'cascade-pending:source:{task_id}', True, PENDING_TIMEOUT)
+    ]
+
+    if not (task_ids or source_ids):
+        return
+
+    try:
+        recompute_cascade.delay(task_ids, source_ids)
+    except Exception:
+        # Nothing was queued (e.g. the broker is down), so don't let the
+        # markers hold back the next attempt. This runs after the request's
+        # transaction has committed, so failing the response would only
+        # make the client retry a write that already went through
+        cache.delete_many(_pending_keys(task_ids, source_ids))
+        logger.exception(
+            'Could not queue status cascade (task_ids=%s, source_ids=%s)',
+            task_ids, source_ids
+        )
+
+
+@shared_task
+def recompute_cascade(task_ids, source_ids):
+    """Run a batched status cascade (see StatusUpdater.propagate)."""
+    # Release the markers first, so changes made from now on queue a new run
+    cache.delete_many(_pending_keys(task_ids, source_ids))
+    StatusUpdater.propagate(task_ids=task_ids, source_ids=source_ids)
@@ -0,0 +1,144 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from tasks.models import Task, TaskDependency
+from tasks.tasks import recompute_cascade
+
+
+class TaskApiTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.task_a = Task.objects.create(title="Task A")
+        self.task_b = Task.objects.create(title="Task B")
+        self.task_c = Task.objects.create(title="Task C")
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
+        TaskDependency.objects.create(task=self.task_b, depends_on=self.task_c)
+    
+    def test_list_tasks_query_count(self):
+        """Listing tasks doesn't issue queries per task or per dependency."""
+        for i in range(5):
+            task = Task.objects.create(title=f"Extra {i}")
+            TaskDependency.objects.create(task=task, depends_on=self.task_a)
+        
+        # tasks + dependencies (with depends_on) + dependent_tasks,
+        # inside the request's savepoint
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/tasks/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 8)
+    
+    def test_retrieve_task_payload(self):
+        """Nested dependencies and dependent task ids are serialized."""
+        response = self.client.get(f'/api/tasks/{self.task_b.id}/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['dependent_tasks'], [self.task_a.id])
+        self.assertEqual(len(response.data['dependencies']), 1)
+        dependency = response.data['dependencies'][0]
+        self.assertEqual(dependency['depends_on'], self.task_c.id)
+        self.assertEqual(dependency['depends_on_title'], "Task C")
+        self.assertEqual(dependency['depends_on_status'], "pending")
+    
+    def test_dependency_graph(self):
+        """Graph endpoint returns every task as a node and every dependency as an edge."""
+        response = self.client.get('/api/dependencies/graph/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(node['id'] for node in response.data['nodes']),
+            sorted([self.task_a.id, self.task_b.id, self.task_c.id])
+        )
+        self.assertEqual(response.data['nodes'][0].keys(), {'id', 'title', 'status'})
+        self.assertCountEqual(response.data['edges'], [
+            {'from': self.task_a.id, 'to': self.task_b.id},
+            {'from': self.task_b.id, 'to': self.task_c.id},
+        ])
+    
+    def test_bulk_add_dependencies(self):
+        """Bulk import creates every new dependency and updates the closure."""
+        task_d = Task.objects.create(title="Task D")
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/dependencies/bulk/', {
+                'dependencies': [
+                    {'task_id': self.task_c.id, 'depends_on_id': task_d.id},
+                    {'task_id': self.task_a.id, 'depends_on_id': self.task_b.id},
+                ]
+            }, format='json')
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {'created': 1})
+        
+        # A now reaches D through B and C, so D → A is circular
+        response = self.client.post(
+            f'/api/tasks/{task_d.id}/dependencies/',
+            {'depends_on_id': self.task_a.id},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['path'],
+            [self.task_a.id, self.task_b.id, self.task_c.id, task_d.id]
+        )
+    
+    def test_bulk_add_rejects_cycles(self):
+        """A batch that closes a cycle is rejected as a whole."""
+        task_d = Task.objects.create(title="Task D")
+        
+        response = self.client.post('/api/dependencies/bulk/', {
+            'dependencies': [
+                {'task_id': self.task_c.id, 'depends_on_id': task_d.id},
+                {'task_id': task_d.id, 'depends_on_id': self.task_a.id},
+            ]
+        }, format='json')
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], "Circular dependency detected")
+        self.assertEqual(TaskDependency.objects.count(), 2)
+    
+    def test_add_dependency_rejects_cycle_with_string_id(self):
+        """A cycle is caught when depends_on_id arrives as a JSON string."""
+        response = self.client.post(
+            f'/api/tasks/{self.task_c.id}/dependencies/',
+            {'depends_on_id': str(self.task_a.id)},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['path'], [self.task_a.id, self.task_b.id, self.task_c.id])
+        self.assertEqual(TaskDependency.objects.count(), 2)
+    
+    def test_add_dependency_response(self):
+        """Adding a dependency returns it with the depends_on task's title and status."""
+        task_d = Task.objects.create(title="Task D", description="x" * 1000)
+        response = self.client.post(
+            f'/api/tasks/{self.task_c.id}/dependencies/',
+            {'depends_on_id': task_d.id},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['depends_on'], task_d.id)
+        self.assertEqual(response.data['depends_on_title'], "Task D")
+        self.assertEqual(response.data['depends_on_status'], "pending")
+    
+    def test_add_dependency_when_broker_is_down(self):
+        """The committed dependency is still reported as created."""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        task_d = Task.objects.create(title="Task D")
+        
+        with mock.patch.object(recompute_cascade, 'delay', side_effect=ConnectionError):
+            with self.assertLogs('tasks.tasks', 'ERROR'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post(
+                        f'/api/tasks/{self.task_c.id}/dependencies/',
+                        {'depends_on_id': task_d.id},
+                        format='json'
+                    )
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(
+            TaskDependency.objects.filter(task=self.task_c, depends_on=task_d).exists()
+        )
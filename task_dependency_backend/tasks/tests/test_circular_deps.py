@@ -1,15 +1,24 @@
+from django.core.cache import cache
 from django.test import TestCase
-from tasks.models import Task, TaskDependency
+from tasks.models import Task, TaskDependency, TaskReachability
 from tasks.services.dependency_checker import DependencyChecker
+from tasks.services.reachability import ReachabilityIndex
 
 
 class CircularDependencyTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create test tasks once for the whole class."""
+        cls.task_a, cls.task_b, cls.task_c, cls.task_d = Task.objects.bulk_create([
+            Task(title="Task A"),
+            Task(title="Task B"),
+            Task(title="Task C"),
+            Task(title="Task D"),
+        ])
+    
     def setUp(self):
-        """Create test tasks."""
-        self.task_a = Task.objects.create(title="Task A")
-        self.task_b = Task.objects.create(title="Task B")
-        self.task_c = Task.objects.create(title="Task C")
-        self.task_d = Task.objects.create(title="Task D")
+        # Cached graphs from other tests would outlive their rows
+        cache.clear()
     
     def test_self_dependency(self):
         """Task cannot depend on itself."""
@@ -42,6 +51,7 @@ class CircularDependencyTestCase(TestCase):
             self.task_c.id, self.task_a.id
         )
         self.assertTrue(is_circular)
+        self.assertEqual(path, [self.task_a.id, self.task_b.id, self.task_c.id])
     
     def test_no_circular_dependency(self):
         """A → B → C is valid, D → A is also valid."""
@@ -59,16 +69,93 @@ class CircularDependencyTestCase(TestCase):
     
     def test_complex_graph_no_cycle(self):
         """Complex dependency graph without cycles."""
-        # A depends on B and C
-        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
-        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_c)
-        # B depends on D
-        TaskDependency.objects.create(task=self.task_b, depends_on=self.task_d)
-        # C depends on D
-        TaskDependency.objects.create(task=self.task_c, depends_on=self.task_d)
+        # A depends on B and C, B and C both depend on D
+        TaskDependency.objects.bulk_create([
+            TaskDependency(task=self.task_a, depends_on=self.task_b),
+            TaskDependency(task=self.task_a, depends_on=self.task_c),
+            TaskDependency(task=self.task_b, depends_on=self.task_d),
+            TaskDependency(task=self.task_c, depends_on=self.task_d),
+        ])
+        # bulk_create skips the signal that maintains the closure
+        ReachabilityIndex.add_dependencies([self.task_a.id, self.task_b.id, self.task_c.id])
         
         # Check if adding D → A would create a cycle
         is_circular, path = DependencyChecker.check_circular_dependency(
             self.task_d.id, self.task_a.id
         )
         self.assertTrue(is_circular)
+        self.assertIn(path, [
+            [self.task_a.id, self.task_b.id, self.task_d.id],
+            [self.task_a.id, self.task_c.id, self.task_d.id],
+        ])
+    
+    def test_deep_chain_beyond_recursion_limit(self):
+        """Chains deeper than Python's recursion limit are still checked."""
+        chain = Task.objects.bulk_create(
+            [Task(title=f"Chain {i}") for i in range(1500)]
+        )
+        TaskDependency.objects.bulk_create([
+            TaskDependency(task=chain[i], depends_on=chain[i + 1])
+            for i in range(len(chain) - 1)
+        ])
+        
+        # bulk_create skips signals, so trace the path directly
+        is_circular, path = DependencyChecker.find_cycle_path(
+            chain[-1].id, chain[0].id
+        )
+        self.assertTrue(is_circular)
+        self.assertEqual(path, [task.id for task in chain])
+    
+    def test_closure_hit_is_circular_without_path(self):
+        """A closure hit stays circular even if no path can be traced."""
+        TaskReachability.objects.create(ancestor=self.task_b, descendant=self.task_a)
+        
+        is_circular, path = DependencyChecker.check_circular_dependency(
+            self.task_a.id, self.task_b.id
+        )
+        self.assertTrue(is_circular)
+        self.assertEqual(path, [])
+    
+    def test_cached_graph_invalidated_on_change(self):
+        """Adding a dependency moves the cached graph to a new version."""
+        forward, _ = DependencyChecker.cached_graph()
+        self.assertEqual(forward[self.task_a.id], [])
+        
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
+        
+        forward, backward = DependencyChecker.cached_graph()
+        self.assertEqual(forward[self.task_a.id], [self.task_b.id])
+        self.assertEqual(backward[self.task_b.id], [self.task_a.id])
+    
+    def test_find_all_cycles(self):
+        """Tarjan's SCC reports every cycle in one pass."""
+        # Insert A → B → C → A directly, bypassing the API check
+        TaskDependency.objects.bulk_create([
+            TaskDependency(task=self.task_a, depends_on=self.task_b),
+            TaskDependency(task=self.task_b, depends_on=self.task_c),
+            TaskDependency(task=self.task_c, depends_on=self.task_a),
+            TaskDependency(task=self.task_d, depends_on=self.task_a),
+        ])
+        
+        cycles = DependencyChecker.find_all_cycles()
+        self.assertEqual(len(cycles), 1)
+        self.assertCountEqual(cycles[0], [self.task_a.id, self.task_b.id, self.task_c.id])
+    
+    def test_check_batch(self):
+        """A batch is circular if its edges close a cycle together."""
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
+        
+        self.assertEqual(DependencyChecker.check_batch([
+            (self.task_b.id, self.task_c.id),
+            (self.task_c.id, self.task_d.id),
+        ]), [])
+        
+        cycles = DependencyChecker.check_batch([
+            (self.task_b.id, self.task_c.id),
+            (self.task_c.id, self.task_a.id),
+        ])
+        self.assertEqual(len(cycles), 1)
+        self.assertCountEqual(cycles[0], [self.task_a.id, self.task_b.id, self.task_c.id])
+        
+        # Self-dependency in a batch
+        self.assertEqual(DependencyChecker.check_batch([(self.task_d.id, self.task_d.id)]), [[self.task_d.id]])
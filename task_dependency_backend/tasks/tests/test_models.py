@@ -26,6 +26,13 @@ class TaskModelTestCase(TestCase):
         # The model orders by -created_at, which means newer first
         self.assertEqual(len(tasks), 2)
     
+    def test_slim_defers_description(self):
+        """slim() leaves description out of the query."""
+        Task.objects.create(title="Test Task", description="Long text")
+        task = Task.objects.slim().get()
+        self.assertEqual(task.get_deferred_fields(), {'description'})
+        self.assertEqual(task.title, "Test Task")
+    
     def test_task_str_representation(self):
         """Task __str__ should return title."""
         task = Task.objects.create(title="My Task")
@@ -33,9 +40,12 @@ class TaskModelTestCase(TestCase):
 
 
 class TaskDependencyModelTestCase(TestCase):
-    def setUp(self):
-        self.task_a = Task.objects.create(title="Task A")
-        self.task_b = Task.objects.create(title="Task B")
+    @classmethod
+    def setUpTestData(cls):
+        cls.task_a, cls.task_b = Task.objects.bulk_create([
+            Task(title="Task A"),
+            Task(title="Task B"),
+        ])
     
     def test_create_dependency(self):
         """Can create a dependency between tasks."""
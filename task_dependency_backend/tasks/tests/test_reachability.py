@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from tasks.models import Task, TaskDependency, TaskReachability
+from tasks.services.reachability import ReachabilityIndex
+
+
+class ReachabilityIndexTestCase(TestCase):
+    def setUp(self):
+        """Create test tasks: A → B → C."""
+        self.task_a = Task.objects.create(title="Task A")
+        self.task_b = Task.objects.create(title="Task B")
+        self.task_c = Task.objects.create(title="Task C")
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
+        TaskDependency.objects.create(task=self.task_b, depends_on=self.task_c)
+
+    def pairs(self):
+        return set(TaskReachability.objects.values_list('ancestor_id', 'descendant_id'))
+
+    def test_closure_after_insert(self):
+        """Adding dependencies records every transitive pair."""
+        self.assertEqual(self.pairs(), {
+            (self.task_a.id, self.task_b.id),
+            (self.task_a.id, self.task_c.id),
+            (self.task_b.id, self.task_c.id),
+        })
+
+    def test_closure_after_delete(self):
+        """Removing B → C also removes A → C."""
+        TaskDependency.objects.get(task=self.task_b, depends_on=self.task_c).delete()
+        self.assertEqual(self.pairs(), {(self.task_a.id, self.task_b.id)})
+
+    def test_closure_keeps_alternative_path(self):
+        """A → C survives removing B → C when A also depends on C directly."""
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_c)
+        TaskDependency.objects.get(task=self.task_b, depends_on=self.task_c).delete()
+        self.assertEqual(self.pairs(), {
+            (self.task_a.id, self.task_b.id),
+            (self.task_a.id, self.task_c.id),
+        })
+
+    def test_closure_after_task_delete(self):
+        """Deleting the middle task disconnects A from C."""
+        self.task_b.delete()
+        self.assertEqual(self.pairs(), set())
+
+    def test_closure_through_shared_dependency(self):
+        """A → D is recorded once when both of A's paths lead to D."""
+        task_d = Task.objects.create(title="Task D")
+        TaskDependency.objects.create(task=self.task_a, depends_on=task_d)
+        TaskDependency.objects.create(task=self.task_c, depends_on=task_d)
+
+        TaskReachability.objects.all().delete()
+        ReachabilityIndex.rebuild()
+        self.assertEqual(ReachabilityIndex.descendants_of(self.task_a.id), {
+            self.task_b.id, self.task_c.id, task_d.id
+        })
+        self.assertEqual(len(self.pairs()), 6)
+
+    def test_add_dependencies_follows_new_edges(self):
+        """Closure rows are added past bulk-inserted edges the closure doesn't know yet."""
+        task_d = Task.objects.create(title="Task D")
+        task_e = Task.objects.create(title="Task E")
+        TaskDependency.objects.create(task=task_d, depends_on=task_e)
+        TaskDependency.objects.bulk_create([
+            TaskDependency(task=self.task_c, depends_on=task_d),
+        ])
+        
+        ReachabilityIndex.add_dependencies([self.task_c.id])
+        self.assertEqual(ReachabilityIndex.descendants_of(self.task_a.id), {
+            self.task_b.id, self.task_c.id, task_d.id, task_e.id
+        })
+    
+    def test_recompute_loads_only_reachable_edges(self):
+        """Recomputing B's rows doesn't read edges outside B's subgraph."""
+        task_d = Task.objects.create(title="Task D")
+        task_e = Task.objects.create(title="Task E")
+        TaskDependency.objects.create(task=task_d, depends_on=task_e)
+        
+        adjacency = ReachabilityIndex._load_subgraph({self.task_b.id})
+        self.assertEqual(dict(adjacency), {self.task_b.id: [self.task_c.id]})
+    
+    def test_rebuild(self):
+        """rebuild() restores the closure after bulk writes that skip signals."""
+        TaskReachability.objects.all().delete()
+        ReachabilityIndex.rebuild()
+        self.assertEqual(len(self.pairs()), 3)
+    
+    def test_rebuild_command(self):
+        """rebuild_reachability repairs a closure that lost rows."""
+        TaskReachability.objects.filter(ancestor=self.task_a, descendant=self.task_c).delete()
+        
+        out = StringIO()
+        call_command('rebuild_reachability', stdout=out)
+        self.assertEqual(len(self.pairs()), 3)
+        self.assertIn("3 reachability rows", out.getvalue())
@@ -1,19 +1,29 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
 from django.test import TestCase
+from tasks import _cascade
+from tasks.tasks import recompute_cascade, schedule_cascade
 from tasks.models import Task, TaskDependency
+from tasks.services.reachability import ReachabilityIndex
 from tasks.services.status_updater import StatusUpdater
 
 
 class StatusUpdaterTestCase(TestCase):
-    def setUp(self):
-        """Create test tasks."""
-        self.task_a = Task.objects.create(title="Task A", status="pending")
-        self.task_b = Task.objects.create(title="Task B", status="pending")
-        self.task_c = Task.objects.create(title="Task C", status="pending")
+    @classmethod
+    def setUpTestData(cls):
+        """Create test tasks once for the whole class."""
+        cls.task_a, cls.task_b, cls.task_c = Task.objects.bulk_create([
+            Task(title="Task A", status="pending"),
+            Task(title="Task B", status="pending"),
+            Task(title="Task C", status="pending"),
+        ])
     
     def test_no_dependencies_no_change(self):
         """Task without dependencies keeps its status."""
         original_status = self.task_a.status
-        StatusUpdater.update_task_status(self.task_a)
+        StatusUpdater.propagate(task_ids=[self.task_a.id])
         self.task_a.refresh_from_db()
         self.assertEqual(self.task_a.status, original_status)
     
@@ -27,7 +37,7 @@ class StatusUpdaterTestCase(TestCase):
         self.task_b.save()
         
         # Update A's status
-        StatusUpdater.update_task_status(self.task_a)
+        StatusUpdater.propagate(task_ids=[self.task_a.id])
         self.task_a.refresh_from_db()
         self.assertEqual(self.task_a.status, 'in_progress')
     
@@ -41,7 +51,7 @@ class StatusUpdaterTestCase(TestCase):
         self.task_b.save()
         
         # Update A's status
-        StatusUpdater.update_task_status(self.task_a)
+        StatusUpdater.propagate(task_ids=[self.task_a.id])
         self.task_a.refresh_from_db()
         self.assertEqual(self.task_a.status, 'blocked')
     
@@ -56,7 +66,7 @@ class StatusUpdaterTestCase(TestCase):
         self.task_b.save()
         
         # Update A's status
-        StatusUpdater.update_task_status(self.task_a)
+        StatusUpdater.propagate(task_ids=[self.task_a.id])
         self.task_a.refresh_from_db()
         self.assertEqual(self.task_a.status, 'pending')
     
@@ -70,7 +80,7 @@ class StatusUpdaterTestCase(TestCase):
         self.task_a.save()
         
         # Update A's status (B is still pending)
-        StatusUpdater.update_task_status(self.task_a)
+        StatusUpdater.propagate(task_ids=[self.task_a.id])
         self.task_a.refresh_from_db()
         self.assertEqual(self.task_a.status, 'completed')
     
@@ -89,3 +99,223 @@ class StatusUpdaterTestCase(TestCase):
         
         self.task_b.refresh_from_db()
         self.assertEqual(self.task_b.status, 'in_progress')
+    
+    def test_blocked_cascades_through_chain(self):
+        """Blocking a task blocks every task that transitively depends on it."""
+        # A depends on B, B depends on C
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
+        TaskDependency.objects.create(task=self.task_b, depends_on=self.task_c)
+        
+        # Block C
+        self.task_c.status = 'blocked'
+        self.task_c.save()
+        
+        StatusUpdater.update_dependent_tasks(self.task_c)
+        
+        self.task_a.refresh_from_db()
+        self.task_b.refresh_from_db()
+        self.assertEqual(self.task_b.status, 'blocked')
+        self.assertEqual(self.task_a.status, 'blocked')
+    
+    def test_diamond_cascade(self):
+        """A depends on B and C, both depend on D: A is ready once D completes."""
+        task_d = Task.objects.create(title="Task D", status="pending")
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_c)
+        TaskDependency.objects.create(task=self.task_b, depends_on=task_d)
+        TaskDependency.objects.create(task=self.task_c, depends_on=task_d)
+        
+        # Complete D
+        task_d.status = 'completed'
+        task_d.save()
+        
+        # closure lookup + row locks + induced subgraph + one UPDATE for B and
+        # C together + one to mirror their status onto dependency rows,
+        # inside a savepoint
+        with self.assertNumQueries(7):
+            StatusUpdater.update_dependent_tasks(task_d)
+        
+        self.task_a.refresh_from_db()
+        self.task_b.refresh_from_db()
+        self.task_c.refresh_from_db()
+        self.assertEqual(self.task_b.status, 'in_progress')
+        self.assertEqual(self.task_c.status, 'in_progress')
+        self.assertEqual(self.task_a.status, 'pending')
+    
+    def test_cascade_query_count_independent_of_fan_out(self):
+        """Many dependents are loaded together, never with one SELECT each."""
+        dependents = Task.objects.bulk_create(
+            [Task(title=f"Dependent {i}") for i in range(20)]
+        )
+        for task in dependents:
+            TaskDependency.objects.create(task=task, depends_on=self.task_c)
+        
+        self.task_c.status = 'completed'
+        self.task_c.save()
+        
+        # closure lookup + row locks + induced subgraph + one UPDATE for all
+        # dependents + one to mirror their status onto dependency rows,
+        # inside a savepoint
+        with self.assertNumQueries(7):
+            StatusUpdater.update_dependent_tasks(self.task_c)
+        
+        self.assertEqual(
+            set(Task.objects.filter(title__startswith="Dependent").values_list('status', flat=True)),
+            {'in_progress'}
+        )
+    
+    def test_depends_on_status_kept_in_sync(self):
+        """TaskDependency mirrors its depends_on task's status on every write path."""
+        self.task_c.status = 'completed'
+        self.task_c.save()
+        b_on_c = TaskDependency.objects.create(task=self.task_b, depends_on=self.task_c)
+        a_on_b = TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
+        self.assertEqual(b_on_c.depends_on_status, 'completed')
+        
+        # Written by the cascade
+        StatusUpdater.update_dependent_tasks(self.task_c)
+        a_on_b.refresh_from_db()
+        self.assertEqual(a_on_b.depends_on_status, 'in_progress')
+        
+        # Written through save()
+        self.task_c.status = 'blocked'
+        self.task_c.save()
+        b_on_c.refresh_from_db()
+        self.assertEqual(b_on_c.depends_on_status, 'blocked')
+    
+    def test_propagate_resolves_leaf_task_in_one_update(self):
+        """A task nothing depends on is resolved by a single conditional UPDATE."""
+        TaskDependency.objects.create(task=self.task_a, depends_on=self.task_b)
+        Task.objects.filter(pk=self.task_b.pk).update(status='completed')
+        TaskDependency.objects.filter(depends_on=self.task_b).update(depends_on_status='completed')
+        
+        # closure lookup + the UPDATE
+        with self.assertNumQueries(2):
+            StatusUpdater.propagate(task_ids=[self.task_a.id])
+        
+        self.task_a.refresh_from_db()
+        self.assertEqual(self.task_a.status, 'in_progress')
+    
+    def test_database_rules_match_resolve_status(self):
+        """The conditional UPDATE and resolve_status agree on every combination."""
+        statuses = ['pending', 'in_progress', 'completed', 'blocked']
+        upstream = {
+            status: Task.objects.create(title=f"Upstream {status}", status=status)
+            for status in statuses
+        }
+        dependency_sets = [
+            [], ['completed'], ['completed', 'completed'], ['pending'],
+            ['in_progress'], ['completed', 'pending'], ['blocked'],
+            ['blocked', 'completed'], ['in_progress', 'completed'],
+        ]
+        
+        for current in statuses:
+            for dependency_statuses in dependency_sets:
+                task = Task.objects.create(title="Leaf", status=current)
+                TaskDependency.objects.bulk_create([
+                    TaskDependency(
+                        task=task,
+                        depends_on=upstream[status],
+                        depends_on_status=status
+                    )
+                    for status in set(dependency_statuses)
+                ])
+                
+                StatusUpdater.propagate(task_ids=[task.id])
+                task.refresh_from_db()
+                self.assertEqual(
+                    task.status,
+                    StatusUpdater.resolve_status(current, dependency_statuses),
+                    (current, dependency_statuses)
+                )
+
+
+class CascadeSignalTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create test tasks: A → B → C."""
+        cls.task_a, cls.task_b, cls.task_c = Task.objects.bulk_create([
+            Task(title="Task A", status="pending"),
+            Task(title="Task B", status="pending"),
+            Task(title="Task C", status="pending"),
+        ])
+        # Everything is pending, so there's nothing for the skipped signals to cascade
+        TaskDependency.objects.bulk_create([
+            TaskDependency(task=cls.task_a, depends_on=cls.task_b),
+            TaskDependency(task=cls.task_b, depends_on=cls.task_c),
+        ])
+        ReachabilityIndex.add_dependencies([cls.task_a.id, cls.task_b.id])
+    
+    def setUp(self):
+        # Queued-cascade markers live in the cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+    
+    def test_status_change_cascades_on_commit(self):
+        """Saving a completed task updates dependents once the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task_c.status = 'completed'
+            self.task_c.save()
+            
+            # Nothing happens until commit
+            self.task_b.refresh_from_db()
+            self.assertEqual(self.task_b.status, 'pending')
+        
+        self.task_b.refresh_from_db()
+        self.assertEqual(self.task_b.status, 'in_progress')
+    
+    def test_changes_flush_once_per_transaction(self):
+        """Several signals in one transaction schedule a single cascade."""
+        with mock.patch.object(
+            _cascade, 'schedule_cascade', wraps=_cascade.schedule_cascade
+        ) as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.task_c.status = 'blocked'
+                self.task_c.save()
+                TaskDependency.objects.create(task=self.task_a, depends_on=self.task_c)
+        
+        self.assertEqual(schedule.call_count, 1)
+        self.task_a.refresh_from_db()
+        self.task_b.refresh_from_db()
+        self.assertEqual(self.task_a.status, 'blocked')
+        self.assertEqual(self.task_b.status, 'blocked')
+    
+    def test_rolled_back_savepoint_keeps_later_changes(self):
+        """Changes queued after a rolled-back savepoint still cascade on commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Task.objects.filter(pk=self.task_c.pk).update(status='completed')
+                    TaskDependency.objects.create(task=self.task_a, depends_on=self.task_c)
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+            
+            self.task_c.status = 'blocked'
+            self.task_c.save()
+        
+        self.task_b.refresh_from_db()
+        self.assertEqual(self.task_b.status, 'blocked')
+    
+    def test_schedule_cascade_skips_queued_roots(self):
+        """A root already waiting in the queue isn't queued twice."""
+        with mock.patch.object(recompute_cascade, 'delay') as delay:
+            schedule_cascade([self.task_a.id], [self.task_c.id])
+            schedule_cascade([self.task_a.id, self.task_b.id], [self.task_c.id])
+        
+        self.assertEqual(delay.call_args_list, [
+            mock.call([self.task_a.id], [self.task_c.id]),
+            mock.call([self.task_b.id], []),
+        ])
+    
+    def test_schedule_cascade_releases_markers_on_failure(self):
+        """A root whose job couldn't be queued can be queued again."""
+        with mock.patch.object(recompute_cascade, 'delay') as delay:
+            delay.side_effect = ConnectionError
+            with self.assertLogs('tasks.tasks', 'ERROR'):
+                schedule_cascade([self.task_a.id], [])
+            
+            delay.side_effect = None
+            schedule_cascade([self.task_a.id], [])
+        
+        self.assertEqual(delay.call_count, 2)
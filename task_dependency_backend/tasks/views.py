@@ -1,17 +1,41 @@
+from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from . import _cascade
 from .models import Task, TaskDependency
-from .serializers import TaskSerializer, TaskDependencySerializer, GraphSerializer
+from .serializers import TaskSerializer, TaskDependencySerializer
 from .services.dependency_checker import DependencyChecker
-from .services.status_updater import StatusUpdater
+from .services.reachability import ReachabilityIndex
 
 
 class TaskViewSet(viewsets.ModelViewSet):
-    queryset = Task.objects.all()
+    # Prefetch everything TaskSerializer reads to avoid N+1 queries on list
+    queryset = Task.objects.prefetch_related(
+        Prefetch(
+            'dependencies',
+            queryset=TaskDependency.objects.select_related('depends_on').only(
+                'id', 'task_id', 'depends_on_id', 'depends_on_status',
+                'created_at', 'depends_on__title'
+            )
+        ),
+        Prefetch(
+            'dependent_tasks',
+            queryset=TaskDependency.objects.only('id', 'task_id', 'depends_on_id')
+        ),
+    )
     serializer_class = TaskSerializer
     
+    def get_queryset(self):
+        # These actions never serialize the task itself, so skip the
+        # prefetches and the description column
+        if self.action in ('add_dependency', 'remove_dependency', 'destroy'):
+            return Task.objects.slim()
+        return super().get_queryset()
+    
     @action(detail=True, methods=['post'], url_path='dependencies')
+    @transaction.atomic
     def add_dependency(self, request, pk=None):
         """
         POST /api/tasks/{id}/dependencies/
@@ -26,19 +50,24 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check if dependency exists
+        # Check if dependency exists; only what the response serializes
         try:
-            depends_on_task = Task.objects.get(id=depends_on_id)
+            depends_on_task = Task.objects.only('id', 'title', 'status').get(id=depends_on_id)
         except Task.DoesNotExist:
             return Response(
                 {"error": "Dependency task not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Check for circular dependency
+        # Hold both tasks until commit, so a concurrent edit can't slip an
+        # edge into the closure between this check and the insert
+        ReachabilityIndex.lock_tasks([task.id, depends_on_task.id])
+        
+        # Check for circular dependency; use the fetched pk, since the
+        # request may send the id as a string
         is_circular, cycle_path = DependencyChecker.check_circular_dependency(
             task.id,
-            depends_on_id
+            depends_on_task.id
         )
         
         if is_circular:
@@ -50,7 +79,8 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create the dependency
+        # Create the dependency; depends_on stays cached on the instance,
+        # so serializing it below needs no further query
         dependency, created = TaskDependency.objects.get_or_create(
             task=task,
             depends_on=depends_on_task
@@ -62,9 +92,6 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update task status based on new dependency
-        StatusUpdater.update_task_status(task)
-        
         serializer = TaskDependencySerializer(dependency)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
@@ -98,7 +125,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         # Check if other tasks depend on this
         dependent_tasks = TaskDependency.objects.filter(
             depends_on=task
-        ).select_related('task')
+        ).select_related('task').only('id', 'task__id', 'task__title')
         
         if dependent_tasks.exists():
             return Response(
@@ -121,12 +148,95 @@ class DependencyGraphView(viewsets.ViewSet):
         """
         GET /api/dependencies/graph/
         """
-        tasks = Task.objects.all()
-        dependencies = TaskDependency.objects.all()
+        # Plain values() rows skip model instantiation and serializer fields
+        nodes = list(Task.objects.values('id', 'title', 'status'))
+        dependencies = TaskDependency.objects.values_list('task_id', 'depends_on_id')
+        edges = [
+            {'from': task_id, 'to': depends_on_id}
+            for task_id, depends_on_id in dependencies.iterator(chunk_size=10000)
+        ]
+        
+        return Response({'nodes': nodes, 'edges': edges})
+    
+    @action(detail=False, methods=['post'])
+    @transaction.atomic
+    def bulk(self, request):
+        """
+        POST /api/dependencies/bulk/
+        Body: {"dependencies": [{"task_id": 1, "depends_on_id": 5}, ...]}
+        """
+        items = request.data.get('dependencies')
+        
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "dependencies must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            pairs = {
+                (int(item['task_id']), int(item['depends_on_id']))
+                for item in items
+            }
+        except (TypeError, KeyError, ValueError):
+            return Response(
+                {"error": "Each dependency needs task_id and depends_on_id"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Check all referenced tasks exist in one query, locking them until
+        # commit (in pk order) so concurrent edits wait for this batch
+        task_ids = {task_id for pair in pairs for task_id in pair}
+        statuses = dict(
+            Task.objects.select_for_update().filter(
+                id__in=task_ids
+            ).order_by('id').values_list('id', 'status')
+        )
+        found_ids = set(statuses)
+        if found_ids != task_ids:
+            return Response(
+                {
+                    "error": "Dependency task not found",
+                    "missing": sorted(task_ids - found_ids)
+                },
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        # Validate the whole batch with one pass over the graph
+        cycles = DependencyChecker.check_batch(pairs)
+        if cycles:
+            return Response(
+                {
+                    "error": "Circular dependency detected",
+                    "cycles": cycles
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        existing = set(
+            TaskDependency.objects.filter(
+                task_id__in={task_id for task_id, _ in pairs}
+            ).values_list('task_id', 'depends_on_id')
+        )
+        new_pairs = pairs - existing
+        TaskDependency.objects.bulk_create(
+            [
+                TaskDependency(
+                    task_id=task_id,
+                    depends_on_id=depends_on_id,
+                    depends_on_status=statuses[depends_on_id]
+                )
+                for task_id, depends_on_id in new_pairs
+            ],
+            ignore_conflicts=True
+        )
         
-        serializer = GraphSerializer({
-            'tasks': tasks,
-            'dependencies': dependencies
-        })
+        # bulk_create skips post_save, so do what the dependency signals would
+        if new_pairs:
+            new_task_ids = {task_id for task_id, _ in new_pairs}
+            ReachabilityIndex.add_dependencies(new_task_ids)
+            DependencyChecker.invalidate_graph()
+            for task_id in new_task_ids:
+                _cascade.mark_dirty(task_id)
         
-        return Response(serializer.data)
+        return Response({"created": len(new_pairs)}, status=status.HTTP_201_CREATED)